@@ -8,7 +8,7 @@
 # run again.  Do not edit this file unless you know what you are doing.
 
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 
 
 class Ui_MainWindow(object):
@@ -31,7 +31,6 @@ class Ui_MainWindow(object):
         self.label_2.setMaximumSize(QtCore.QSize(640, 480))
         self.label_2.setLineWidth(1)
         self.label_2.setText("")
-        self.label_2.setPixmap(QtGui.QPixmap("shades.png")) #inserting the photo
         self.label_2.setScaledContents(False)
         self.label_2.setObjectName("label_2")
         self.horizontalLayout.addWidget(self.label_2)
@@ -39,7 +38,6 @@ class Ui_MainWindow(object):
         self.label.setMinimumSize(QtCore.QSize(640, 480))
         self.label.setMaximumSize(QtCore.QSize(640, 480))
         self.label.setText("")
-        self.label.setPixmap(QtGui.QPixmap("shades 2.png")) #inserting the photo
         self.label.setScaledContents(False)
         self.label.setObjectName("label")
         self.horizontalLayout.addWidget(self.label)
@@ -147,20 +145,9 @@ class Ui_MainWindow(object):
         MainWindow.setStatusBar(self.statusbar)
 
         self.retranslateUi(MainWindow)
-        QtCore.QMetaObject.connectSlotsByName(MainWindow)
 
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
         MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
         self.pushButton.setText(_translate("MainWindow", "NEXT"))
         self.pushButton_2.setText(_translate("MainWindow", "OK"))
-
-
-if __name__ == "__main__":
-    import sys
-    app = QtWidgets.QApplication(sys.argv)
-    MainWindow = QtWidgets.QMainWindow()
-    ui = Ui_MainWindow()
-    ui.setupUi(MainWindow)
-    MainWindow.show()
-    sys.exit(app.exec_())
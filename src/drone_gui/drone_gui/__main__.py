@@ -0,0 +1,19 @@
+import sys
+
+from PyQt5.QtWidgets import QApplication, QMainWindow
+
+from drone_gui.gui_v2 import Ui_MainWindow
+
+
+def main():
+    # Preview of the photos_sized.ui layout, without ROS
+    app = QApplication(sys.argv)
+    MainWindow = QMainWindow()
+    ui = Ui_MainWindow()
+    ui.setupUi(MainWindow)
+    MainWindow.show()
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    main()
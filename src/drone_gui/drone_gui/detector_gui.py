@@ -6,7 +6,7 @@ from sensor_msgs.msg import Image  # Image is the message type
 from cv_bridge import CvBridge  # Package to convert between ROS and OpenCV Images
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import pyqtSignal, pyqtSlot, Qt, QThread
-import time
+import functools
 from PyQt5.QtWidgets import QMainWindow, QApplication, QMenu, QAction, QStyle, qApp, QMessageBox
 from PyQt5.QtCore import Qt, QTimer
 import numpy as np
@@ -15,6 +15,21 @@ from std_msgs.msg import Int32MultiArray
 import sys
 
 
+# Size of both camera preview labels, shared by their min/max size settings
+_FRAME_SIZE = QtCore.QSize(640, 480)
+
+# Threshold slider rows: (row layout, label or None, slider, spin box, column layout).
+# Lower thresholds (R, G, B) go to the left column, upper ones to the right.
+_THRESHOLD_ROWS = (
+    ("horizontalLayout_2", "label_3", "horizontalSlider", "spinBox", "verticalLayout"),
+    ("horizontalLayout_3", "label_4", "horizontalSlider_2", "spinBox_2", "verticalLayout"),
+    ("horizontalLayout_4", "label_5", "horizontalSlider_3", "spinBox_3", "verticalLayout"),
+    ("horizontalLayout_5", None, "horizontalSlider_4", "spinBox_4", "verticalLayout_2"),
+    ("horizontalLayout_6", None, "horizontalSlider_5", "spinBox_5", "verticalLayout_2"),
+    ("horizontalLayout_7", None, "horizontalSlider_6", "spinBox_6", "verticalLayout_2"),
+)
+
+
 class Ui_MainWindow(object):
 
     def __init__(self):
@@ -62,16 +77,6 @@ class Ui_MainWindow(object):
         self.thresholds_publisher = self.node.create_publisher(Int32MultiArray,
                                                                "detector_thresholds",
                                                                10)
-        # spin once, timeout_sec 5[s]
-        timeout_sec_rclpy = 5
-        timeout_init = time.time()
-        rclpy.spin_once(self.node, timeout_sec=timeout_sec_rclpy)
-        timeout_end = time.time()
-        ros_connect_time = timeout_end - timeout_init
-        if ros_connect_time >= timeout_sec_rclpy:
-            print("ros connection successful")
-        else:
-            print("ros connection failed")
         #     Start timer
         # 10 FPS
         self.timer.start(100)
@@ -138,8 +143,8 @@ class Ui_MainWindow(object):
         self.horizontalLayout.setSizeConstraint(QtWidgets.QLayout.SetNoConstraint)
         self.horizontalLayout.setObjectName("horizontalLayout")
         self.label_2 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_2.setMinimumSize(QtCore.QSize(640, 480))
-        self.label_2.setMaximumSize(QtCore.QSize(640, 480))
+        self.label_2.setMinimumSize(_FRAME_SIZE)
+        self.label_2.setMaximumSize(_FRAME_SIZE)
         self.label_2.setLineWidth(1)
         self.label_2.setText("")
         self.label_2.setPixmap(QtGui.QPixmap())
@@ -147,8 +152,8 @@ class Ui_MainWindow(object):
         self.label_2.setObjectName("label_2")
         self.horizontalLayout.addWidget(self.label_2)
         self.label = QtWidgets.QLabel(self.layoutWidget)
-        self.label.setMinimumSize(QtCore.QSize(640, 480))
-        self.label.setMaximumSize(QtCore.QSize(640, 480))
+        self.label.setMinimumSize(_FRAME_SIZE)
+        self.label.setMaximumSize(_FRAME_SIZE)
         self.label.setText("")
         self.label.setPixmap(QtGui.QPixmap())
         self.label.setScaledContents(False)
@@ -161,90 +166,30 @@ class Ui_MainWindow(object):
         self.horizontalLayout_8.setObjectName("horizontalLayout_8")
         self.verticalLayout = QtWidgets.QVBoxLayout()
         self.verticalLayout.setObjectName("verticalLayout")
-        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
-        self.label_3 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_3.setObjectName("label_3")
-        self.horizontalLayout_2.addWidget(self.label_3)
-        self.horizontalSlider = QtWidgets.QSlider(self.layoutWidget)
-        self.horizontalSlider.setMaximum(255)
-        self.horizontalSlider.setOrientation(QtCore.Qt.Horizontal)
-        self.horizontalSlider.setObjectName("horizontalSlider")
-        self.horizontalLayout_2.addWidget(self.horizontalSlider)
-        self.spinBox = QtWidgets.QSpinBox(self.layoutWidget)
-        self.spinBox.setMaximum(255)
-        self.spinBox.setObjectName("spinBox")
-        self.horizontalLayout_2.addWidget(self.spinBox)
-        self.verticalLayout.addLayout(self.horizontalLayout_2)
-        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
-        self.label_4 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_4.setObjectName("label_4")
-        self.horizontalLayout_3.addWidget(self.label_4)
-        self.horizontalSlider_2 = QtWidgets.QSlider(self.layoutWidget)
-        self.horizontalSlider_2.setMaximum(255)
-        self.horizontalSlider_2.setOrientation(QtCore.Qt.Horizontal)
-        self.horizontalSlider_2.setObjectName("horizontalSlider_2")
-        self.horizontalLayout_3.addWidget(self.horizontalSlider_2)
-        self.spinBox_2 = QtWidgets.QSpinBox(self.layoutWidget)
-        self.spinBox_2.setMaximum(255)
-        self.spinBox_2.setObjectName("spinBox_2")
-        self.horizontalLayout_3.addWidget(self.spinBox_2)
-        self.verticalLayout.addLayout(self.horizontalLayout_3)
-        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
-        self.label_5 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_5.setObjectName("label_5")
-        self.horizontalLayout_4.addWidget(self.label_5)
-        self.horizontalSlider_3 = QtWidgets.QSlider(self.layoutWidget)
-        self.horizontalSlider_3.setMaximum(255)
-        self.horizontalSlider_3.setOrientation(QtCore.Qt.Horizontal)
-        self.horizontalSlider_3.setObjectName("horizontalSlider_3")
-        self.horizontalLayout_4.addWidget(self.horizontalSlider_3)
-        self.spinBox_3 = QtWidgets.QSpinBox(self.layoutWidget)
-        self.spinBox_3.setMaximum(255)
-        self.spinBox_3.setObjectName("spinBox_3")
-        self.horizontalLayout_4.addWidget(self.spinBox_3)
-        self.verticalLayout.addLayout(self.horizontalLayout_4)
-        self.horizontalLayout_8.addLayout(self.verticalLayout)
         self.verticalLayout_2 = QtWidgets.QVBoxLayout()
         self.verticalLayout_2.setObjectName("verticalLayout_2")
-        self.horizontalLayout_5 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
-        self.horizontalSlider_4 = QtWidgets.QSlider(self.layoutWidget)
-        self.horizontalSlider_4.setMaximum(255)
-        self.horizontalSlider_4.setOrientation(QtCore.Qt.Horizontal)
-        self.horizontalSlider_4.setObjectName("horizontalSlider_4")
-        self.horizontalLayout_5.addWidget(self.horizontalSlider_4)
-        self.spinBox_4 = QtWidgets.QSpinBox(self.layoutWidget)
-        self.spinBox_4.setMaximum(255)
-        self.spinBox_4.setObjectName("spinBox_4")
-        self.horizontalLayout_5.addWidget(self.spinBox_4)
-        self.verticalLayout_2.addLayout(self.horizontalLayout_5)
-        self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
-        self.horizontalSlider_5 = QtWidgets.QSlider(self.layoutWidget)
-        self.horizontalSlider_5.setMaximum(255)
-        self.horizontalSlider_5.setOrientation(QtCore.Qt.Horizontal)
-        self.horizontalSlider_5.setObjectName("horizontalSlider_5")
-        self.horizontalLayout_6.addWidget(self.horizontalSlider_5)
-        self.spinBox_5 = QtWidgets.QSpinBox(self.layoutWidget)
-        self.spinBox_5.setMaximum(255)
-        self.spinBox_5.setObjectName("spinBox_5")
-        self.horizontalLayout_6.addWidget(self.spinBox_5)
-        self.verticalLayout_2.addLayout(self.horizontalLayout_6)
-        self.horizontalLayout_7 = QtWidgets.QHBoxLayout()
-        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
-        self.horizontalSlider_6 = QtWidgets.QSlider(self.layoutWidget)
-        self.horizontalSlider_6.setMaximum(255)
-        self.horizontalSlider_6.setOrientation(QtCore.Qt.Horizontal)
-        self.horizontalSlider_6.setObjectName("horizontalSlider_6")
-        self.horizontalLayout_7.addWidget(self.horizontalSlider_6)
-        self.spinBox_6 = QtWidgets.QSpinBox(self.layoutWidget)
-        self.spinBox_6.setMaximum(255)
-        self.spinBox_6.setObjectName("spinBox_6")
-        self.horizontalLayout_7.addWidget(self.spinBox_6)
-        self.verticalLayout_2.addLayout(self.horizontalLayout_7)
+        for row_name, label_name, slider_name, spin_box_name, column_name in _THRESHOLD_ROWS:
+            row = QtWidgets.QHBoxLayout()
+            row.setObjectName(row_name)
+            setattr(self, row_name, row)
+            if label_name is not None:
+                label = QtWidgets.QLabel(self.layoutWidget)
+                label.setObjectName(label_name)
+                setattr(self, label_name, label)
+                row.addWidget(label)
+            slider = QtWidgets.QSlider(self.layoutWidget)
+            slider.setMaximum(255)
+            slider.setOrientation(QtCore.Qt.Horizontal)
+            slider.setObjectName(slider_name)
+            setattr(self, slider_name, slider)
+            row.addWidget(slider)
+            spin_box = QtWidgets.QSpinBox(self.layoutWidget)
+            spin_box.setMaximum(255)
+            spin_box.setObjectName(spin_box_name)
+            setattr(self, spin_box_name, spin_box)
+            row.addWidget(spin_box)
+            getattr(self, column_name).addLayout(row)
+        self.horizontalLayout_8.addLayout(self.verticalLayout)
         self.horizontalLayout_8.addLayout(self.verticalLayout_2)
         self.horizontalLayout_9.addLayout(self.horizontalLayout_8)
         self.verticalLayout_3 = QtWidgets.QVBoxLayout()
@@ -276,13 +221,13 @@ class Ui_MainWindow(object):
         MainWindow.setStatusBar(self.statusbar)
 
         self.retranslateUi(MainWindow)
-        QtCore.QMetaObject.connectSlotsByName(MainWindow)
         # connect functions with sliders and buttons
         self.connect_signals()
         # Set upper sliders to max value (255)
         self.set_sliders_default()
-        # initialize ros connection and start subscriber
-        self.ros_init()
+        # initialize ros connection and start subscriber from the event loop, after
+        # setupUi returns; ros_init only creates the node and starts the timer, it never spins
+        QTimer.singleShot(0, self.ros_init)
 
     def connect_signals(self):
         # Sliders
@@ -305,12 +250,8 @@ class Ui_MainWindow(object):
         self.pushButton.clicked.connect(self.stop_start_button_clicked)
 
         # Spin Boxes
-        self.spinBox.valueChanged.connect(self.horizontalSlider.setValue)
-        self.spinBox_2.valueChanged.connect(self.horizontalSlider_2.setValue)
-        self.spinBox_3.valueChanged.connect(self.horizontalSlider_3.setValue)
-        self.spinBox_4.valueChanged.connect(self.horizontalSlider_4.setValue)
-        self.spinBox_5.valueChanged.connect(self.horizontalSlider_5.setValue)
-        self.spinBox_6.valueChanged.connect(self.horizontalSlider_6.setValue)
+        for _, _, slider_name, spin_box_name, _ in _THRESHOLD_ROWS:
+            getattr(self, spin_box_name).valueChanged.connect(getattr(self, slider_name).setValue)
 
     def set_sliders_default(self):
         self.horizontalSlider.setValue(0)
@@ -419,16 +360,16 @@ class Ui_MainWindow(object):
         print(i.text())
 
     def retranslateUi(self, MainWindow):
-        _translate = QtCore.QCoreApplication.translate
-        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
-        self.label_3.setText(_translate("MainWindow", "Red"))
-        self.label_4.setText(_translate("MainWindow", "Green"))
-        self.label_5.setText(_translate("MainWindow", "Blue"))
-        self.radioButton.setText(_translate("MainWindow", "Brown"))
-        self.radioButton_3.setText(_translate("MainWindow", "Beige"))
-        self.radioButton_2.setText(_translate("MainWindow", "Golden"))
-        self.pushButton.setText(_translate("MainWindow", "Stop/Start"))
-        self.pushButton_2.setText(_translate("MainWindow", "OK"))
+        _tr = functools.partial(QtCore.QCoreApplication.translate, "MainWindow")
+        MainWindow.setWindowTitle(_tr("MainWindow"))
+        self.label_3.setText(_tr("Red"))
+        self.label_4.setText(_tr("Green"))
+        self.label_5.setText(_tr("Blue"))
+        self.radioButton.setText(_tr("Brown"))
+        self.radioButton_3.setText(_tr("Beige"))
+        self.radioButton_2.setText(_tr("Golden"))
+        self.pushButton.setText(_tr("Stop/Start"))
+        self.pushButton_2.setText(_tr("OK"))
 
 
 def main(args=None):
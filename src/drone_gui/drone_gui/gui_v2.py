@@ -8,7 +8,7 @@
 # run again.  Do not edit this file unless you know what you are doing.
 
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 
 
 class Ui_MainWindow(object):
@@ -31,7 +31,6 @@ class Ui_MainWindow(object):
         self.label_2.setMaximumSize(QtCore.QSize(640, 480))
         self.label_2.setLineWidth(1)
         self.label_2.setText("")
-        self.label_2.setPixmap(QtGui.QPixmap("../../../../../../Downloads/shades 2.png"))
         self.label_2.setScaledContents(False)
         self.label_2.setObjectName("label_2")
         self.horizontalLayout.addWidget(self.label_2)
@@ -39,7 +38,6 @@ class Ui_MainWindow(object):
         self.label.setMinimumSize(QtCore.QSize(640, 480))
         self.label.setMaximumSize(QtCore.QSize(640, 480))
         self.label.setText("")
-        self.label.setPixmap(QtGui.QPixmap("../../../../../../Downloads/shades.png"))
         self.label.setScaledContents(False)
         self.label.setObjectName("label")
         self.horizontalLayout.addWidget(self.label)
@@ -165,7 +163,6 @@ class Ui_MainWindow(object):
         MainWindow.setStatusBar(self.statusbar)
 
         self.retranslateUi(MainWindow)
-        QtCore.QMetaObject.connectSlotsByName(MainWindow)
 
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
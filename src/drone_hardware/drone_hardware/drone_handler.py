@@ -1,43 +1,117 @@
 import rclpy
-from dronekit import connect, VehicleMode, LocationLocal, LocationGlobalRelative
-from pymavlink import mavutil
 
-import argparse
-import time
 import math
+import os
+import threading
+from math import sqrt
 
 from rclpy.node import Node
-from rclpy.action import ActionServer
+from rclpy.action import ActionServer, CancelResponse, GoalResponse
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup, ReentrantCallbackGroup
+from rclpy.executors import MultiThreadedExecutor
+from rclpy.logging import LoggingSeverity
+from rclpy.task import Future
 
 from drone_interfaces.srv import GetAttitude, GetLocationRelative, SetServo, SetYaw, SetMode
 from drone_interfaces.action import GotoRelative, GotoGlobal, Arm, Takeoff
 
+# Use MAVLink 2 framing (zero-truncated payloads). pymavlink picks its dialect when it is
+# first imported, so this must precede the imports below (no effect if already imported).
+os.environ.setdefault('MAVLINK20', '1')
+from dronekit import connect, VehicleMode, LocationLocal, LocationGlobalRelative  # noqa: E402
+from pymavlink import mavutil  # noqa: E402
+
+# goto actions succeed once the vehicle is within 0.5 m of the destination,
+# compared on squared distances
+ARRIVAL_RADIUS_SQ = 0.5 * 0.5
+# length of one degree of latitude (and of longitude at the equator) in meters
+METERS_PER_DEGREE = 1.113195e5
+# flight mode the vehicle is handed over to when the node shuts down
+RTL_MODE = VehicleMode("RTL")
+
+# MAVLink constants used by the send helpers, resolved once at import
+FRAME_LOCAL_NED = mavutil.mavlink.MAV_FRAME_LOCAL_NED
+FRAME_GLOBAL_RELATIVE_ALT_INT = mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT
+CMD_CONDITION_YAW = mavutil.mavlink.MAV_CMD_CONDITION_YAW
+CMD_DO_SET_SERVO = mavutil.mavlink.MAV_CMD_DO_SET_SERVO
+# set_position_target type_mask: ignore velocity, acceleration and yaw, use positions only
+POSITION_TYPE_MASK = 0b0000111111111000
+
+# seconds the arm action waits for the vehicle before its goal is aborted
+ARM_TIMEOUT = 60.0
+
+
 class DroneHandler(Node):
     def __init__(self):
         super().__init__('drone_handler')
 
+        # CALLBACK GROUPS
+        # Telemetry queries are read-only and may run in parallel with anything. Each action
+        # server gets its own group for its goal/cancel requests; the execute callbacks
+        # themselves run as executor tasks outside these groups, so overlapping goals are
+        # rejected in goal_callback instead
+        self._svc_group = ReentrantCallbackGroup()
+        self._goto_rel_group = MutuallyExclusiveCallbackGroup()
+        self._goto_global_group = MutuallyExclusiveCallbackGroup()
+        self._arm_group = MutuallyExclusiveCallbackGroup()
+        self._takeoff_group = MutuallyExclusiveCallbackGroup()
+
         ## DECLARE SERVICES
-        self.attitude = self.create_service(GetAttitude, 'get_attitude', self.get_attitude_callback)
-        self.gps = self.create_service(GetLocationRelative, 'get_location_relative', self.get_location_relative_callback)
+        self.attitude = self.create_service(GetAttitude, 'get_attitude',
+                                            self.get_attitude_callback,
+                                            callback_group=self._svc_group)
+        self.gps = self.create_service(GetLocationRelative, 'get_location_relative',
+                                       self.get_location_relative_callback,
+                                       callback_group=self._svc_group)
         self.servo = self.create_service(SetServo, 'set_servo', self.set_servo_callback)
         self.yaw = self.create_service(SetYaw, 'set_yaw', self.set_yaw_callback)
         self.mode = self.create_service(SetMode, 'set_mode',self.set_mode_callback)
         
         ## DECLARE ACTIONS
-        self.goto_rel = ActionServer(self, GotoRelative, 'goto_relative', self.goto_relative_action)
-        self.goto_global = ActionServer(self, GotoGlobal, 'goto_global', self.goto_global_action)
-        self.arm = ActionServer(self,Arm, 'Arm',self.arm_callback)
-        self.takeoff = ActionServer(self, Takeoff, 'takeoff',self.takeoff_callback)
+        self.goto_rel = ActionServer(self, GotoRelative, 'goto_relative',
+                                     self.goto_relative_action,
+                                     goal_callback=self.goal_callback,
+                                     cancel_callback=self.cancel_callback,
+                                     callback_group=self._goto_rel_group)
+        self.goto_global = ActionServer(self, GotoGlobal, 'goto_global', self.goto_global_action,
+                                        goal_callback=self.goal_callback,
+                                        cancel_callback=self.cancel_callback,
+                                        callback_group=self._goto_global_group)
+        self.arm = ActionServer(self,Arm, 'Arm',self.arm_callback,
+                                goal_callback=self.goal_callback,
+                                cancel_callback=self.cancel_callback,
+                                callback_group=self._arm_group)
+        self.takeoff = ActionServer(self, Takeoff, 'takeoff',self.takeoff_callback,
+                                    goal_callback=self.goal_callback,
+                                    cancel_callback=self.cancel_callback,
+                                    callback_group=self._takeoff_group)
+
+        # ACTION RESULTS
+        # Every action returns the same constant success result, build it once
+        self._goto_rel_result = GotoRelative.Result(result=1)
+        self._goto_global_result = GotoGlobal.Result(result=1)
+        self._arm_result = Arm.Result(result=1)
+        self._takeoff_result = Takeoff.Result(result=1)
 
         ## DRONE MEMBER VARIABLES
         self.state = "BUSY"
+        # goal_callback runs on several executor threads, claim the drone under a lock
+        self._goal_lock = threading.Lock()
+        # meters per degree of longitude, scaled by cos(latitude) at the start of each global goto
+        self._mlon = METERS_PER_DEGREE
 
         ##CONNECT TO COPTER
-        parser = argparse.ArgumentParser(description='commands')
-        parser.add_argument('--connect', default='127.0.0.1:14550')
-        args = parser.parse_args()
-
-        connection_string = args.connect
+        # ros2 run drone_hardware drone_handler --ros-args -p connect:=<connection string>
+        # (an empty string starts a SITL instance)
+        self.declare_parameter('connect', '127.0.0.1:14550')
+        connection_string = self.get_parameter('connect').get_parameter_value().string_value
+        # seconds a goto / takeoff may take before the vehicle holds position and the goal is
+        # aborted, 0 waits until the vehicle arrives
+        self.declare_parameter('goto_timeout', 0.0)
+        self.declare_parameter('takeoff_timeout', 0.0)
+        self._goto_timeout = self.get_parameter('goto_timeout').get_parameter_value().double_value
+        self._takeoff_timeout = \
+            self.get_parameter('takeoff_timeout').get_parameter_value().double_value
 
         sitl = None
 
@@ -49,43 +123,49 @@ class DroneHandler(Node):
         baud_rate = 57600
 
         self.vehicle = connect(connection_string, baud=baud_rate, wait_ready=False) #doesnt work with wait_ready=True
+
+        # POSITION TARGET MESSAGES
+        # Built once, goto_position_target_* only update the position fields before sending.
+        # pymavlink still assigns the sequence number and CRC when the message is sent.
+        self._local_ned_msg = self.vehicle.message_factory.set_position_target_local_ned_encode(
+            0,       # time_boot_ms (not used)
+            0, 0,    # target system, target component
+            FRAME_LOCAL_NED, # frame
+            POSITION_TYPE_MASK, # type_mask (only positions enabled)
+            0, 0, 0, # x, y, z positions (North, East, Down), set per goto
+            0, 0, 0, # x, y, z velocity in m/s  (not used)
+            0, 0, 0, # x, y, z acceleration (not supported yet, ignored in GCS_Mavlink)
+            0, 0)    # yaw, yaw_rate (not supported yet, ignored in GCS_Mavlink)
+        self._global_int_msg = self.vehicle.message_factory.set_position_target_global_int_encode(
+            0,       # time_boot_ms (not used)
+            0, 0,    # target system, target component
+            FRAME_GLOBAL_RELATIVE_ALT_INT, # frame
+            POSITION_TYPE_MASK, # type_mask (only positions enabled)
+            0, 0, 0, # lat_int, lon_int (1e7 * degrees), alt (meters above home, set per goto)
+            0, 0, 0, # x, y, z velocity in NED frame in m/s (not used)
+            0, 0, 0, # afx, afy, afz acceleration (not supported yet, ignored in GCS_Mavlink)
+            0, 0)    # yaw, yaw_rate (not supported yet, ignored in GCS_Mavlink)
+
         self.state = "OK"
         self.get_logger().info("Copter connected, ready to arm")
 
-    def __del__(self):
-        self.vehicle.mode=VehicleMode("RTL")
-
     ## INTERNAL HELPER METHODS
+    # goto setpoints are sent once per goal, never re-sent or deduplicated (the vehicle may move)
     def goto_position_target_local_ned(self, north, east, down=-1):
         if down == -1:
             down = self.vehicle.location.local_frame.down
-        msg = self.vehicle.message_factory.set_position_target_local_ned_encode(
-            0,       # time_boot_ms (not used)
-            0, 0,    # target system, target component
-            mavutil.mavlink.MAV_FRAME_LOCAL_NED, # frame
-            0b0000111111111000, # type_mask (only positions enabled)
-            north, east, down, # x, y, z positions (or North, East, Down in the MAV_FRAME_BODY_NED frame
-            0, 0, 0, # x, y, z velocity in m/s  (not used)
-            0, 0, 0, # x, y, z acceleration (not supported yet, ignored in GCS_Mavlink)
-            0, 0)    # yaw, yaw_rate (not supported yet, ignored in GCS_Mavlink)
+        msg = self._local_ned_msg
+        msg.x = north
+        msg.y = east
+        msg.z = down
         # send command to vehicle
         self.vehicle.send_mavlink(msg)
 
     def goto_position_target_global_int(self, location):
-        msg = self.vehicle.message_factory.set_position_target_global_int_encode(
-        0,       # time_boot_ms (not used)
-        0, 0,    # target system, target component
-        mavutil.mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT, # frame
-        0b0000111111111000, # type_mask (only speeds enabled)
-        location.lat*1e7, # lat_int - X Position in WGS84 frame in 1e7 * meters
-        location.lon*1e7, # lon_int - Y Position in WGS84 frame in 1e7 * meters
-        location.alt, # alt - Altitude in meters in AMSL altitude, not WGS84 if absolute or relative, above terrain if GLOBAL_TERRAIN_ALT_INT
-        0, # X velocity in NED frame in m/s
-        0, # Y velocity in NED frame in m/s
-        0, # Z velocity in NED frame in m/s
-        0, 0, 0, # afx, afy, afz acceleration (not supported yet, ignored in GCS_Mavlink)
-        0, 0)    # yaw, yaw_rate (not supported yet, ignored in GCS_Mavlink)
-
+        msg = self._global_int_msg
+        msg.lat_int = int(location.lat*1e7) # X Position in WGS84 frame in 1e7 * degrees
+        msg.lon_int = int(location.lon*1e7) # Y Position in WGS84 frame in 1e7 * degrees
+        msg.alt = location.alt # Altitude in meters, relative to home
         # send command to vehicle
         self.vehicle.send_mavlink(msg)
 
@@ -104,7 +184,7 @@ class DroneHandler(Node):
         # create the CONDITION_YAW command using command_long_encode()
         msg = self.vehicle.message_factory.command_long_encode(
             0, 0,        # target system, target component
-            mavutil.mavlink.MAV_CMD_CONDITION_YAW, #command
+            CMD_CONDITION_YAW, #command
             0,           #confirmation
             yaw,         # param 1, yaw in degrees
             0,           # param 2, yaw speed deg/s
@@ -118,7 +198,7 @@ class DroneHandler(Node):
         msg = self.vehicle.message_factory.command_long_encode(
             0,          # time_boot_ms (not used)
             0, 0,       # target system, target component
-            mavutil.mavlink.MAV_CMD_DO_SET_SERVO, #command
+            CMD_DO_SET_SERVO, #command
             0,          #not used
             servo_id,   #number of servo instance
             pwm,        #pwm value for servo control
@@ -126,17 +206,72 @@ class DroneHandler(Node):
         # send command to vehicle
         self.vehicle.send_mavlink(msg)
 
+    async def wait_for_attribute(self, observed, attr_name, condition, timeout=0.0):
+        # Wait until condition(value) holds for a DroneKit attribute. The condition is
+        # evaluated on every telemetry update of the attribute (on the DroneKit thread),
+        # so there is no fixed-interval polling of the vehicle. The listener resolves the
+        # future itself and only then wakes the executor, so the awaiting task is re-polled
+        # after the result is set. Returns False if the timeout (in seconds, 0 for none)
+        # expires first.
+        reached = Future()
+        executor = self.executor
+
+        def finish(result):
+            if not reached.done():
+                reached.set_result(result)
+                executor.wake()
+
+        def listener(_, name, value):
+            if not reached.done() and condition(value):
+                finish(True)
+
+        observed.add_attribute_listener(attr_name, listener)
+        timer = self.create_timer(timeout, lambda: finish(False)) if timeout > 0 else None
+        try:
+            if condition(getattr(observed, attr_name)):
+                finish(True)
+            return await reached
+        finally:
+            if timer is not None:
+                self.destroy_timer(timer)
+            observed.remove_attribute_listener(attr_name, listener)
+
+    def _abort_goal(self, goal_handle, result, hold=True):
+        # End a goal whose wait timed out. Moving goals first make the vehicle hold its
+        # current position, it must not keep flying once the drone is released for new goals
+        if hold:
+            self.get_logger().warn("Goal timed out, holding position")
+            local_frame = self.vehicle.location.local_frame
+            self.goto_position_target_local_ned(local_frame.north, local_frame.east,
+                                                local_frame.down)
+        else:
+            self.get_logger().warn("Goal timed out")
+        goal_handle.abort()
+        return result
+
+    # Each vehicle.location frame access goes through a DroneKit property that builds
+    # a new Location object, so read the frame once (or reuse the listener's value)
+    def _squared_distance_rel(self, location, local_frame=None):
+        if local_frame is None:
+            local_frame = self.vehicle.location.local_frame
+        dnorth = location.north - local_frame.north
+        deast = location.east - local_frame.east
+        ddown = location.down - local_frame.down
+        return dnorth*dnorth + deast*deast + ddown*ddown
+
+    def _squared_distance_global(self, location, global_relative_frame=None):
+        if global_relative_frame is None:
+            global_relative_frame = self.vehicle.location.global_relative_frame
+        dlat = (location.lat - global_relative_frame.lat) * METERS_PER_DEGREE
+        dlon = (location.lon - global_relative_frame.lon) * self._mlon
+        dalt = location.alt - global_relative_frame.alt
+        return dlat*dlat + dlon*dlon + dalt*dalt
+
     def calculate_remaining_distance_rel(self, location):
-        dnorth = location.north - self.vehicle.location.local_frame.north
-        deast = location.east - self.vehicle.location.local_frame.east
-        ddown = location.down - self.vehicle.location.local_frame.down
-        return math.sqrt(dnorth*dnorth + deast*deast + ddown*ddown)
+        return sqrt(self._squared_distance_rel(location))
     
     def calculate_remaining_distance_global(self, location):
-        dlat = (location.lat - self.vehicle.location.global_relative_frame.lat) * 1.113195e5 ## lat/lon to meters convert magic number
-        dlon = (location.lon - self.vehicle.location.global_relative_frame.lon) * 1.113195e5 ## lat/lon to meters convert magic number
-        ddown = location.down - self.vehicle.location.global_relative_frame.down
-        return math.sqrt(dlat*dlat + dlon*dlon + ddown*ddown)
+        return sqrt(self._squared_distance_global(location))
 
     ## SERVICE CALLBACKS
     def get_attitude_callback(self, request, response):
@@ -144,10 +279,12 @@ class DroneHandler(Node):
         response.roll=temp.roll
         response.pitch=temp.pitch
         response.yaw=temp.yaw
-        self.get_logger().info(f"-- Get attitude service called --")
-        self.get_logger().info(f"Roll: {response.roll}")
-        self.get_logger().info(f"Pitch: {response.pitch}")
-        self.get_logger().info(f"Yaw: {response.yaw}")
+        logger = self.get_logger()
+        if logger.is_enabled_for(LoggingSeverity.INFO):
+            logger.info(f"-- Get attitude service called --\n"
+                        f"Roll: {response.roll}\n"
+                        f"Pitch: {response.pitch}\n"
+                        f"Yaw: {response.yaw}")
         return response
     
     def get_location_relative_callback(self, request, response):
@@ -155,10 +292,12 @@ class DroneHandler(Node):
         response.north = temp.north
         response.east = temp.east
         response.down = temp.down
-        self.get_logger().info(f"-- Get location relative service called --")
-        self.get_logger().info(f"North: {response.north}")
-        self.get_logger().info(f"East: {response.east}")
-        self.get_logger().info(f"Down: {response.down}")
+        logger = self.get_logger()
+        if logger.is_enabled_for(LoggingSeverity.INFO):
+            logger.info(f"-- Get location relative service called --\n"
+                        f"North: {response.north}\n"
+                        f"East: {response.east}\n"
+                        f"Down: {response.down}")
         return response
     
     def set_yaw_callback(self, request, response):
@@ -177,119 +316,162 @@ class DroneHandler(Node):
         return response
 
     ## ACTION CALLBACKS
-    def goto_relative_action(self, goal_handle):
-        self.get_logger().info(f'-- Goto relative action registered. Destination in local frame: --')
-
-        north = self.vehicle.location.local_frame.north + goal_handle.request.north
-        east = self.vehicle.location.local_frame.east + goal_handle.request.east
-        down = self.vehicle.location.local_frame.down + goal_handle.request.down
-        destination = LocationLocal(north, east, down)
-
-        self.get_logger().info(f'North: {destination.north}')
-        self.get_logger().info(f'East: {destination.east}')
-        self.get_logger().info(f'Down: {destination.down}')
-
-        self.state = "BUSY"
-
-        self.goto_position_target_local_ned(destination.north, destination.east, destination.down)
-
-        feedback_msg = GotoRelative.Feedback()
-        feedback_msg.distance = self.calculate_remaining_distance_rel(destination)
-        self.get_logger().info(f"Distance remaining: {feedback_msg.distance} m")
-
-        while feedback_msg.distance>0.5:
-            feedback_msg.distance = self.calculate_remaining_distance_rel(destination)
-            self.get_logger().info(f"Distance remaining: {feedback_msg.distance} m")
-            time.sleep(1)
-
-        goal_handle.succeed()
-        self.state = "OK"
-        result = GotoRelative.Result()
-        result.result=1
-
-        return result
+    def goal_callback(self, goal_request):
+        # Only one action may drive the vehicle at a time, the goal that claims the drone
+        # releases it (state back to "OK") when its execute callback returns
+        with self._goal_lock:
+            if self.state != "OK":
+                self.get_logger().warn("Drone busy, goal rejected")
+                return GoalResponse.REJECT
+            self.state = "BUSY"
+        return GoalResponse.ACCEPT
+
+    def cancel_callback(self, goal_handle):
+        # A goal cannot be stopped halfway (the setpoint or takeoff is already sent), so
+        # cancel requests are rejected rather than reporting a flying vehicle as canceled
+        return CancelResponse.REJECT
+
+    async def goto_relative_action(self, goal_handle):
+        try:
+            self.get_logger().info(
+                f'-- Goto relative action registered. Destination in local frame: --')
+
+            local_frame = self.vehicle.location.local_frame
+            north = local_frame.north + goal_handle.request.north
+            east = local_frame.east + goal_handle.request.east
+            down = local_frame.down + goal_handle.request.down
+            destination = LocationLocal(north, east, down)
+
+            self.get_logger().info(f'North: {destination.north}')
+            self.get_logger().info(f'East: {destination.east}')
+            self.get_logger().info(f'Down: {destination.down}')
+
+            self.goto_position_target_local_ned(destination.north, destination.east,
+                                                destination.down)
+
+            feedback_msg = GotoRelative.Feedback()
+
+            def destination_reached(local_frame):
+                squared_distance = self._squared_distance_rel(destination, local_frame)
+                feedback_msg.distance = sqrt(squared_distance)
+                logger = self.get_logger()
+                if logger.is_enabled_for(LoggingSeverity.DEBUG):
+                    logger.debug(f"Distance remaining: {feedback_msg.distance} m")
+                goal_handle.publish_feedback(feedback_msg)
+                return squared_distance <= ARRIVAL_RADIUS_SQ
+
+            if not await self.wait_for_attribute(self.vehicle.location, 'local_frame',
+                                                 destination_reached, self._goto_timeout):
+                return self._abort_goal(goal_handle, GotoRelative.Result())
+            self.get_logger().info("Destination reached")
+
+            goal_handle.succeed()
+            return self._goto_rel_result
+        finally:
+            self.state = "OK"
     
-    def goto_global_action(self, goal_handle):
-        self.get_logger().info(f'-- Goto global action registered. Destination in global frame: --')
-
-        lat = self.vehicle.location.global_relative_frame.lat + goal_handle.request.lat
-        lon = self.vehicle.location.global_relative_frame.lon + goal_handle.request.lon
-        alt = self.vehicle.location.global_relative_frame.alt + goal_handle.request.alt
-        destination=LocationGlobalRelative(lat,lon,alt)
-
-        self.get_logger().info(f'Latitude: {destination.lat}')
-        self.get_logger().info(f'Longitude: {destination.lon}')
-        self.get_logger().info(f'Altitude: {destination.alt}')
-
-        self.state = "BUSY"
-
-        self.goto_position_target_local_ned(destination.north, destination.east, destination.alt)
-
-        feedback_msg = GotoGlobal.Feedback()
-        feedback_msg.distance = self.calculate_remaining_distance_rel(destination)
-        self.get_logger().info(f"Distance remaining: {feedback_msg.distance} m")
-
-        while feedback_msg.distance>0.5:
-            feedback_msg.distance = self.calculate_remaining_distance_global(destination)
-            self.get_logger().info(f"Distance remaining: {feedback_msg.distance} m")
-            time.sleep(1)
-
-        goal_handle.succeed()
-        self.state = "OK"
-        result = GotoGlobal.Result()
-        result.result = 1
-
-        return result
+    async def goto_global_action(self, goal_handle):
+        try:
+            self.get_logger().info(
+                f'-- Goto global action registered. Destination in global frame: --')
+
+            global_relative_frame = self.vehicle.location.global_relative_frame
+            # distance moved during one goto is small, one cosine per action is accurate enough
+            self._mlon = METERS_PER_DEGREE * math.cos(math.radians(global_relative_frame.lat))
+            lat = global_relative_frame.lat + goal_handle.request.lat
+            lon = global_relative_frame.lon + goal_handle.request.lon
+            alt = global_relative_frame.alt + goal_handle.request.alt
+            destination=LocationGlobalRelative(lat,lon,alt)
+
+            self.get_logger().info(f'Latitude: {destination.lat}')
+            self.get_logger().info(f'Longitude: {destination.lon}')
+            self.get_logger().info(f'Altitude: {destination.alt}')
+
+            self.goto_position_target_global_int(destination)
+
+            feedback_msg = GotoGlobal.Feedback()
+
+            def destination_reached(global_relative_frame):
+                squared_distance = self._squared_distance_global(destination,
+                                                                 global_relative_frame)
+                feedback_msg.distance = sqrt(squared_distance)
+                logger = self.get_logger()
+                if logger.is_enabled_for(LoggingSeverity.DEBUG):
+                    logger.debug(f"Distance remaining: {feedback_msg.distance} m")
+                goal_handle.publish_feedback(feedback_msg)
+                return squared_distance <= ARRIVAL_RADIUS_SQ
+
+            if not await self.wait_for_attribute(self.vehicle.location, 'global_relative_frame',
+                                                 destination_reached, self._goto_timeout):
+                return self._abort_goal(goal_handle, GotoGlobal.Result())
+            self.get_logger().info("Destination reached")
+
+            goal_handle.succeed()
+            return self._goto_global_result
+        finally:
+            self.state = "OK"
     
-    def arm_callback(self, goal_handle):
-        self.get_logger().info(f'-- Arm action registered --')
-        self.state = "BUSY"
-        feedback_msg = Arm.Feedback()
-        
-        while self.vehicle.is_armable==False:
+    async def arm_callback(self, goal_handle):
+        try:
+            self.get_logger().info(f'-- Arm action registered --')
+            feedback_msg = Arm.Feedback()
+            
+            # is_armable is derived from mode, GPS fix and EKF state and has no listener of its
+            # own, so re-check it on every GPS_RAW_INT update
             feedback_msg.feedback = "Waiting for vehicle to become armable..."
             self.get_logger().info(feedback_msg.feedback)
-            time.sleep(1)
+            goal_handle.publish_feedback(feedback_msg)
+            if not await self.wait_for_attribute(self.vehicle, 'gps_0',
+                                                 lambda _: self.vehicle.is_armable, ARM_TIMEOUT):
+                return self._abort_goal(goal_handle, Arm.Result(), hold=False)
 
-        self.vehicle.armed=True
-        while self.vehicle.armed==False:
+            self.vehicle.armed=True
             feedback_msg.feedback = "Waiting for drone to become armed..."
             self.get_logger().info(feedback_msg.feedback)
-            time.sleep(1)
-
-        feedback_msg.feedback = "Vehicle is now armed."
-        self.get_logger().info(feedback_msg.feedback)
+            goal_handle.publish_feedback(feedback_msg)
+            if not await self.wait_for_attribute(self.vehicle, 'armed', bool, ARM_TIMEOUT):
+                return self._abort_goal(goal_handle, Arm.Result(), hold=False)
 
-        self.state = "OK"
-        
-        goal_handle.succeed()
-        self.state = "OK"
-        result = Arm.Result()
-        result.result = 1
+            feedback_msg.feedback = "Vehicle is now armed."
+            self.get_logger().info(feedback_msg.feedback)
+            goal_handle.publish_feedback(feedback_msg)
 
-        return result
+            goal_handle.succeed()
+            return self._arm_result
+        finally:
+            self.state = "OK"
     
-    def takeoff_callback(self, goal_handle):
-        feedback_msg = Takeoff.Feedback()
-
-        self.state = "OK"
-        self.vehicle.simple_takeoff(goal_handle.request.altitude)
-
-        # Wait until the vehicle reaches a safe height before processing the goto (otherwise the command
-        #  after Vehicle.simple_takeoff will execute immediately).
-        while self.vehicle.location.global_relative_frame.alt >= goal_handle.request.altitude * 0.97:
-            feedback_msg.altitude = self.vehicle.location.global_relative_frame.alt
-            self.get_logger().info(f"Altitude: {feedback_msg.altitude}")
-            time.sleep(1)
-
-        self.get_logger().info("Reached target altitude")
-        
-        goal_handle.succeed()
-        self.state = "OK"
-        result = Takeoff.Result()
-        result.result = 1
-
-        return result
+    async def takeoff_callback(self, goal_handle):
+        try:
+            feedback_msg = Takeoff.Feedback()
+            target_altitude = goal_handle.request.altitude * 0.97
+
+            self.vehicle.simple_takeoff(goal_handle.request.altitude)
+
+            # Wait until the vehicle reaches a safe height before processing the goto (otherwise
+            #  the command after Vehicle.simple_takeoff will execute immediately).
+            #  takeoff_timeout also ends the goal if the vehicle ignores simple_takeoff
+            #  (e.g. not in GUIDED mode).
+            def altitude_reached(global_relative_frame):
+                if global_relative_frame.alt is None:
+                    return False
+                feedback_msg.altitude = global_relative_frame.alt
+                logger = self.get_logger()
+                if logger.is_enabled_for(LoggingSeverity.DEBUG):
+                    logger.debug(f"Altitude: {feedback_msg.altitude}")
+                goal_handle.publish_feedback(feedback_msg)
+                return global_relative_frame.alt >= target_altitude
+
+            if not await self.wait_for_attribute(self.vehicle.location, 'global_relative_frame',
+                                                 altitude_reached, self._takeoff_timeout):
+                return self._abort_goal(goal_handle, Takeoff.Result())
+
+            self.get_logger().info("Reached target altitude")
+            
+            goal_handle.succeed()
+            return self._takeoff_result
+        finally:
+            self.state = "OK"
 
 
 
@@ -298,12 +480,24 @@ def main():
     
     drone = DroneHandler()
 
-    rclpy.spin(drone)
-
-    drone.destroy_node()
-
-    rclpy.shutdown()
-
-
-if __name__ == 'main':
+    executor = MultiThreadedExecutor(num_threads=4)
+    executor.add_node(drone)
+    try:
+        executor.spin()
+    finally:
+        # return to launch on any shutdown, including Ctrl+C; each step runs even if
+        # an earlier one raises, and the context may already be shut down by the signal handler
+        try:
+            drone.vehicle.mode = RTL_MODE
+        finally:
+            try:
+                drone.vehicle.close()
+            finally:
+                try:
+                    drone.destroy_node()
+                finally:
+                    rclpy.try_shutdown()
+
+
+if __name__ == '__main__':
     main()
\ No newline at end of file